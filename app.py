@@ -1,21 +1,29 @@
 import os
+import stat
+import tempfile
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+# File I/O buffer size, read chunk size and number of lines written at once
+BUFFER_SIZE = 1 << 20
+READ_CHUNK_SIZE = 64 * 1024
+WRITE_CHUNK_LINES = 1000
+
 
 class TextEditor(tk.Tk):
     """
     A text editor allows users to edit multiple files at the same time.
     """
 
-    def __init__(self, text_contents=None):
+    def __init__(self):
         super().__init__()
 
-        # track text contents in each tab using dictionary
-        if not text_contents:
-            self.text_contents = {}
-        else:
-            self.text_contents = text_contents
+        # Map each tab container name to its text area
+        self._text_area_by_tab = {}
+
+        # Map each tab container name to its label (without '*') and unsaved state
+        self._tab_labels = {}
+        self._dirty = {}
 
         self.title('Text Editor')
 
@@ -54,7 +62,6 @@ class TextEditor(tk.Tk):
         self.help_menu.add_command(label='About', command=self.show_about_info)
 
         # Bind events
-        self.bind('<KeyPress>', lambda e: self.check_for_changes())
         self.bind('<Control-n>', lambda e: self.create_file())
         self.bind('<Control-o>', lambda e: self.open_file())
         self.bind('<Control-s>', lambda e: self.save_file())
@@ -67,62 +74,79 @@ class TextEditor(tk.Tk):
         """
         Create a new tab.
         """
+        tab_container, text_area = self._build_tab()
+
+        # Insert previous content before the tab is shown
+        text_area.insert('end', content)
+
+        self._add_tab(tab_container, text_area, title)
 
-        # Create a tab container
+    def _build_tab(self):
+        """
+        Build a tab container and its text area without adding it to the notebook.
+        """
+
+        # Create a tab container (the notebook manages its geometry)
         tab_container = ttk.Frame(self.notebook)
-        tab_container.pack()
+        tab_container.rowconfigure(0, weight=1)
+        tab_container.columnconfigure(0, weight=1)
 
         # Create text area (the left side in tab container)
-        text_area = tk.Text(tab_container, font=(
-            "Helvetica", 16), highlightthickness=0)  # without focus border
-
-        # Insert previous content
-        text_area.insert('end', content)
-        text_area.pack(side='left', fill='both', expand=True)
-        text_area.focus()
+        # Unsaved changes are tracked by Tk's modified flag, not by comparing
+        # content with the saved file. With undo enabled, undoing edits back to
+        # the last save clears the flag again, but editing the text back by hand
+        # (e.g. typing a character and deleting it) leaves the tab unsaved.
+        text_area = tk.Text(tab_container, font=("Helvetica", 16),
+                            highlightthickness=0,  # without focus border
+                            undo=True, autoseparators=True, maxundo=-1)
+        text_area.grid(row=0, column=0, sticky='nsew')
 
         # Create Scrollbar (the right side in tab container)
         # Set the Scrollbar widget's command option to the text's yview method
         text_scroll = ttk.Scrollbar(
             tab_container, orient='vertical', command=text_area.yview)
-        text_scroll.pack(side='right', fill='y')
+        text_scroll.grid(row=0, column=1, sticky='ns')
         # Set the text widget's yscrollcommand option to the Scrollbar's set method.
         text_area['yscrollcommand'] = text_scroll.set
 
+        return tab_container, text_area
+
+    def _add_tab(self, tab_container, text_area, title):
+        """
+        Add a built tab container to the notebook and select it.
+        """
+
+        # Loaded content should not be undoable
+        text_area.edit_reset()
+
         # Add a tab to the notebook and select the tab container
         self.notebook.add(tab_container, text=title)
         self.notebook.select(tab_container)
+        text_area.focus()
+        self._text_area_by_tab[str(tab_container)] = text_area
+        self._tab_labels[str(tab_container)] = title
+        self._dirty[str(tab_container)] = False
 
-        # Compare if the content changed
-        self.text_contents[str(text_area)] = hash(
-            content)  # e.g., .!frame.!notebook.!frame.!text
+        # Let Tk track changes: the <<Modified>> event fires whenever the flag flips
+        text_area.edit_modified(False)
+        text_area.bind('<<Modified>>', self._on_modified)
 
     def get_text_area(self):
         """
-        Find tab container (child Frame of notebook) and return text_area (child Text of tab container)
+        Return text_area of the current tab container (child Frame of notebook)
         """
 
         # notebook.select() is to return the current tab container name (string)
         tab_container_name = self.notebook.select()  # e.g., .!frame.!notebook.!frame
 
-        # Find the tab container by name
-        tab_container = self.nametowidget(tab_container_name)
-
-        # Index 0 is text_area and index 1 is scrollbar
-        text_area = tab_container.winfo_children()[0]
-
-        return text_area
+        return self._text_area_by_tab[str(tab_container_name)]
 
     def is_current_tab_unsaved(self):
         """
         Return True if current tab is unsaved.
         Return False if current tab is saved.
         """
-        # Get text content
-        text_area = self.get_text_area()
-        content = text_area.get('1.0', 'end-1c')
-
-        return hash(content) != self.text_contents[str(text_area)]
+        return bool(self.get_text_area().edit_modified())
 
     def confirm_close(self):
         """
@@ -146,26 +170,27 @@ class TextEditor(tk.Tk):
         # Close the tab if the current tab is unsaved and the user confirm to close
         # Close the tab if the current tab is saved
         self.notebook.forget(tab_container_name)
+        self.nametowidget(tab_container_name).destroy()
+        self._text_area_by_tab.pop(str(tab_container_name), None)
+        self._tab_labels.pop(str(tab_container_name), None)
+        self._dirty.pop(str(tab_container_name), None)
         if len(self.notebook.tabs()) == 0:
             self.create_file()
 
-    def check_for_changes(self):
+    def _on_modified(self, event):
         """
-        Check file changes whenever a key is pressed
+        Update the tab label whenever the modified flag of a text area changes.
         """
-        text_area = self.get_text_area()
-        content = text_area.get('1.0', 'end-1c')
+        text_area = event.widget
+        tab_container_name = str(text_area.master)
+        modified = bool(text_area.edit_modified())
 
-        # Get info of current tab info {'padding': [0], 'sticky': 'nsew', 'text': 'Untitled',... }
-        tab_info = self.notebook.tab('current')
-        tab_label = tab_info['text']
-
-        if hash(content) != self.text_contents[str(text_area)]:
-            if tab_label[-1] != '*':
-                self.notebook.tab('current', text=tab_label + '*')
-        else:
-            if tab_label[-1] == '*':
-                self.notebook.tab('current', text=tab_label[:-1])
+        # Only call into Tk when the unsaved state actually changes
+        if modified != self._dirty[tab_container_name]:
+            tab_label = self._tab_labels[tab_container_name]
+            self.notebook.tab(tab_container_name,
+                              text=tab_label + '*' if modified else tab_label)
+            self._dirty[tab_container_name] = modified
 
     def save_file(self):
         """
@@ -173,24 +198,64 @@ class TextEditor(tk.Tk):
         """
         file_path = filedialog.asksaveasfilename(defaultextension='.txt')
 
-        try:
-            filename = os.path.basename(file_path)
-            text_area = self.get_text_area()
-            content = text_area.get('1.0', 'end-1c')
+        # An empty path means the dialog was cancelled
+        if not file_path:
+            print('Save Operation Cancelled.')
+            return None
 
-            # Write content in the file
-            with open(file_path, 'w') as file:
-                file.write(content)
+        filename = os.path.basename(file_path)
+        text_area = self.get_text_area()
 
-        except (AttributeError, FileNotFoundError):
-            print('Save Operation Cancelled.')
+        try:
+            self._write_file(text_area, file_path)
+
+        except (OSError, UnicodeEncodeError) as error:
+            messagebox.showerror(
+                title='Save Failed', message=f'Could not save {filename}: {error}')
             return None
 
         # Change the current tab label
         self.notebook.tab('current', text=filename)
+        self._tab_labels[str(self.notebook.select())] = filename
+
+        # Mark the content as saved
+        text_area.edit_modified(False)
+
+    def _write_file(self, text_area, file_path):
+        """
+        Write the content of text_area to file_path through a temporary file,
+        so a failed save leaves any existing file untouched.
+        """
+        # Replace the target of a symlink rather than the link itself
+        file_path = os.path.realpath(file_path)
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(file_path), prefix='.', suffix='.tmp')
 
-        # Update text contents
-        self.text_contents[str(text_area)] = hash(content)
+        try:
+            last_line = int(text_area.index('end-1c').split('.')[0])
+
+            # Write content in the file a block of lines at a time
+            with open(fd, 'w', buffering=BUFFER_SIZE, encoding='utf-8') as file:
+                for line in range(1, last_line + 1, WRITE_CHUNK_LINES):
+                    next_line = line + WRITE_CHUNK_LINES
+                    end = f'{next_line}.0' if next_line <= last_line else 'end-1c'
+                    file.write(text_area.get(f'{line}.0', end))
+
+            # mkstemp creates the file as 0600, so keep the permissions of the
+            # file being replaced or the usual ones for a new file
+            try:
+                mode = stat.S_IMODE(os.stat(file_path).st_mode)
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(temp_path, mode)
+
+            os.replace(temp_path, file_path)
+
+        except BaseException:
+            os.remove(temp_path)
+            raise
 
     def open_file(self):
         """
@@ -198,34 +263,40 @@ class TextEditor(tk.Tk):
         """
         file_path = filedialog.askopenfilename()
 
-        try:
-            # read the file content
-            filename = os.path.basename(file_path)
-            with open(file_path, 'r') as file:
-                content = file.read()
-
-        except (AttributeError, FileNotFoundError):
+        # An empty path means the dialog was cancelled
+        if not file_path:
             print('Open Operation Cancelled.')
             return None
 
-        self.create_file(content, filename)
+        filename = os.path.basename(file_path)
+        tab_container, text_area = self._build_tab()
+
+        # Fill the text area before the tab is shown, so Tk lays it out once
+        try:
+            with open(file_path, 'r', buffering=BUFFER_SIZE, encoding='utf-8') as file:
+                # Read the file content in chunks instead of one large string
+                while chunk := file.read(READ_CHUNK_SIZE):
+                    text_area.insert('end', chunk)
+
+        except (OSError, UnicodeDecodeError) as error:
+            # Discard the half-built tab
+            tab_container.destroy()
+            messagebox.showerror(
+                title='Open Failed', message=f'Could not open {filename}: {error}')
+            return None
+
+        # Place the cursor at the start of the file
+        text_area.mark_set('insert', '1.0')
+
+        self._add_tab(tab_container, text_area, filename)
 
     def confirm_quit(self):
         """
         Quit the text editor.
         """
-        unsaved = False
-
-        # Check if all the tabs are saved
-        for tab_container_name in self.notebook.tabs():
-            tab_container = self.nametowidget(tab_container_name)
-            text_area = tab_container.winfo_children()[0]
-            content = text_area.get('1.0', 'end-1c')
-
-            # If any tab is not saved then breaks
-            if hash(content) != self.text_contents[str(text_area)]:
-                unsaved = True
-                break
+        # Check if any of the tabs is unsaved
+        unsaved = any(text_area.edit_modified()
+                      for text_area in self._text_area_by_tab.values())
 
         # Confirm close when there is a unsaved file
         if unsaved and not self.confirm_close():